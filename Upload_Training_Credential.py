@@ -1,13 +1,15 @@
 import os
 import sys
+import numpy as np
 import pandas as pd
-import hashlib
 from datetime import datetime
+from typing import Tuple
 
 from src.exception import MyException
 from src.logger import logging
 from src.constants import LOGIN_CREDENTIALS_COLLECTION_NAME
 from src.data_access.proj1_data import Proj1Data
+from src.utils.main_utils import hash_password, hash_passwords
 
 
 class CredentialUploader:
@@ -17,10 +19,17 @@ class CredentialUploader:
 
     def __init__(self):
         """
-        Initializes the Proj1Data instance for MongoDB operations.
+        Initializes the Proj1Data instance for MongoDB operations and
+        ensures each user_id can only be stored once (older duplicate rows
+        from earlier uploads are removed, keeping the newest per user_id).
         """
         try:
             self.data_access = Proj1Data()
+            self.data_access.ensure_unique_index(
+                collection_name = LOGIN_CREDENTIALS_COLLECTION_NAME,
+                field = 'user_id',
+                keep_latest_by = 'created_at'
+            )
             logging.info("CredentialUploader initialized successfully.")
 
         except Exception as e:
@@ -29,7 +38,7 @@ class CredentialUploader:
     @staticmethod
     def hash_password(password: str) -> str:
         """
-        Hashes a password using SHA-256.
+        Hashes a password using Argon2id.
 
         Parameters:
         ----------
@@ -39,9 +48,9 @@ class CredentialUploader:
         Returns:
         -------
         str
-            Hashed password in hexadecimal format.
+            Encoded Argon2id hash (algorithm parameters, salt and digest).
         """
-        return hashlib.sha256(password.encode()).hexdigest()
+        return hash_password(password)
 
     def create_credentials_dataframe(self, credentials: list) -> pd.DataFrame:
         """
@@ -61,27 +70,37 @@ class CredentialUploader:
             if not credentials:
                 raise ValueError("Credentials list is empty.")
 
-            # Process credentials and hash passwords
-            processed_credentials = []
+            # Fill one typed array per column instead of building a dict per row
+            n = len(credentials)
+            user_ids = np.empty(n, dtype=object)
+            hashed_passwords = np.empty(n, dtype=object)
+            passwords = []
 
-            for cred in credentials:
+            for i, cred in enumerate(credentials):
                 if 'user_id' not in cred or 'password' not in cred:
                     raise ValueError("Each credential must have 'user_id' and 'password' keys.")
 
-                processed_credentials.append({
-                    'user_id': cred['user_id'],
-                    'hashed_password': self.hash_password(cred['password']),
-                    'created_at': datetime.now()
-                })
+                user_ids[i] = cred['user_id']
+                passwords.append(cred['password'])
+
+            # All rows in an upload batch share the same creation timestamp
+            created_at = np.full(n, np.datetime64(datetime.now(), 'ns'))
+
+            # Hash all passwords in one batch
+            hashed_passwords[:] = hash_passwords(passwords)
 
-            df = pd.DataFrame(processed_credentials)
+            df = pd.DataFrame({
+                'user_id': user_ids,
+                'hashed_password': hashed_passwords,
+                'created_at': created_at
+            }, copy=False)
             logging.info(f"Created credentials DataFrame with {len(df)} records.")
             return df
 
         except Exception as e:
             raise MyException(e, sys)
 
-    def upload_credentials(self, credentials: list) -> None:
+    def upload_credentials(self, credentials: list) -> Tuple[int, int]:
         """
         Uploads login credentials to MongoDB.
 
@@ -93,6 +112,11 @@ class CredentialUploader:
                 {'user_id': 'admin', 'password': 'admin123'},
                 {'user_id': 'trainer', 'password': 'train456'}
             ]
+
+        Returns:
+        -------
+        Tuple[int, int]
+            Number of credentials inserted (new user_ids) and updated (existing user_ids).
         """
         try:
             logging.info("Starting credential upload process...")
@@ -100,31 +124,35 @@ class CredentialUploader:
             # Create DataFrame from credentials
             df = self.create_credentials_dataframe(credentials)
 
-            # Insert into MongoDB
-            self.data_access.insert_dataframe(
+            # Upsert into MongoDB so re-uploading a user_id replaces its stored hash
+            inserted_count, updated_count = self.data_access.upsert_dataframe(
                 df = df,
-                collection_name = LOGIN_CREDENTIALS_COLLECTION_NAME
+                collection_name = LOGIN_CREDENTIALS_COLLECTION_NAME,
+                key_field = 'user_id'
             )
 
-            logging.info(f"Successfully uploaded {len(df)} credentials to MongoDB.")
-            print(f"✅ Successfully uploaded {len(df)} credentials to MongoDB collection '{LOGIN_CREDENTIALS_COLLECTION_NAME}'")
+            logging.info(f"Successfully uploaded credentials to MongoDB: {inserted_count} new, {updated_count} updated.")
+            print(f"✅ Successfully uploaded credentials to MongoDB collection '{LOGIN_CREDENTIALS_COLLECTION_NAME}': "
+                  f"{inserted_count} new, {updated_count} updated")
+            return inserted_count, updated_count
 
         except Exception as e:
             raise MyException(e, sys)
 
     def fetch_all_credentials(self) -> pd.DataFrame:
         """
-        Fetches all credentials from MongoDB.
+        Fetches all credentials from MongoDB, without their password hashes.
 
         Returns:
         -------
         pd.DataFrame
-            DataFrame containing all stored credentials.
+            DataFrame with user_id and created_at columns for all stored credentials.
         """
         try:
             logging.info("Fetching all credentials from MongoDB...")
             df = self.data_access.export_collection_as_dataframe(
-                collection_name = LOGIN_CREDENTIALS_COLLECTION_NAME
+                collection_name = LOGIN_CREDENTIALS_COLLECTION_NAME,
+                projection = {'user_id': 1, 'created_at': 1, '_id': 0}
             )
             logging.info(f"Fetched {len(df)} credentials from MongoDB.")
             return df
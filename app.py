@@ -4,20 +4,48 @@ from fastapi.responses import Response, RedirectResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from uvicorn import run as app_run
+from contextlib import asynccontextmanager
 from typing import Optional
-import hashlib
+import asyncio
+import threading
+import time
 import sys
 
 # Importing constants and pipeline modules from the project
-from src.constants import APP_HOST, APP_PORT, LOGIN_CREDENTIALS_COLLECTION_NAME
+from src.constants import APP_HOST, APP_PORT, LOGIN_CREDENTIALS_COLLECTION_NAME, CREDENTIALS_CACHE_TTL_SECONDS, \
+    CREDENTIALS_REFRESH_RETRY_SECONDS
 from src.pipline.prediction_pipeline import VehicleData, VehicleDataClassifier
 from src.pipline.training_pipeline import TrainPipeline
 from src.data_access.proj1_data import Proj1Data
+from src.configuration.aws_connection import get_s3_client
 from src.exception import MyException
 from src.logger import logging
+from src.utils.main_utils import hash_password, verify_password, password_needs_rehash
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Creates the credential manager off the event loop at startup and warms its cache,
+    so the MongoDB round-trip does not block the server from binding.
+    Also builds the shared S3 client up front, off the first prediction's critical path.
+    """
+    try:
+        await asyncio.to_thread(get_s3_client)
+    except Exception as e:
+        # Missing AWS credentials surface again on the first S3 operation
+        logging.error(f"Failed to initialize S3 client: {str(e)}")
+
+    try:
+        app.state.cred_mgr = await asyncio.to_thread(CredentialManager)
+        await asyncio.to_thread(app.state.cred_mgr.refresh_credentials)
+    except Exception as e:
+        logging.error(f"Failed to initialize credential manager: {str(e)}")
+        app.state.cred_mgr = None
+    yield
+
 
 # Initialize FastAPI application
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # Mount the 'static' directory for serving static files (like CSS)
 app.mount("/static", StaticFiles(directory="static"), name="static")
@@ -25,6 +53,16 @@ app.mount("/static", StaticFiles(directory="static"), name="static")
 # Set up Jinja2 template engine for rendering HTML templates
 templates = Jinja2Templates(directory='templates')
 
+# Pre-render the fixed login-failure pages of /train once instead of on every failed attempt
+AUTH_UNAVAILABLE_PAGE = templates.get_template("vehicle_data.html").render(
+    error_message="Authentication system is not available. Please contact administrator.",
+    context=None
+)
+INVALID_CREDENTIALS_PAGE = templates.get_template("vehicle_data.html").render(
+    error_message="Invalid User ID or Password!",
+    context=None
+)
+
 # Allow all origins for Cross-Origin Resource Sharing (CORS)
 origins = ["*"]
 
@@ -42,53 +80,76 @@ app.add_middleware(
 class CredentialManager:
     """
     Manages user credential verification by loading from MongoDB.
+
+    Credentials are cached lazily and refreshed from MongoDB once the cache
+    is older than CREDENTIALS_CACHE_TTL_SECONDS. A failed refresh keeps the
+    previous cache and is retried after CREDENTIALS_REFRESH_RETRY_SECONDS;
+    the default credentials are only used while nothing was ever loaded.
     """
     
     def __init__(self):
         """
-        Initialize the credential manager and load credentials from MongoDB.
+        Initialize the credential manager. Credentials are loaded on first use.
         """
         try:
             self.data_access = Proj1Data()
             self.credentials_cache = {}
-            self.load_credentials()
+            # Hash checked for unknown users so their logins take as long as known ones
+            self.dummy_hash = hash_password("")
+            # Hashed once here rather than on every refresh that falls back to them
+            self.default_credentials = {
+                "admin": hash_password("admin123"),
+                "trainer": hash_password("train456"),
+            }
+            self._loaded = False
+            self._ttl = CREDENTIALS_CACHE_TTL_SECONDS
+            self._cache_expiry = 0.0
+            self._lock = threading.Lock()
             
         except Exception as e:
             logging.error(f"Error initializing CredentialManager: {str(e)}")
             raise MyException(e, sys)
     
-    def load_credentials(self):
+    def load_credentials(self) -> bool:
         """
         Load all credentials from MongoDB into cache.
+
+        Returns:
+            bool: True if MongoDB was read successfully, False if the previous cache was kept.
         """
         try:
             logging.info("Loading credentials from MongoDB...")
-            df = self.data_access.export_collection_as_dataframe(
-                collection_name = LOGIN_CREDENTIALS_COLLECTION_NAME
+            docs = self.data_access.iter_projected(
+                collection_name = LOGIN_CREDENTIALS_COLLECTION_NAME,
+                projection = {'user_id': 1, 'hashed_password': 1, '_id': 0}
             )
+
+            # Load credentials from MongoDB
+            credentials = {doc['user_id']: doc['hashed_password'] for doc in docs}
             
-            if df.empty:
+            if not credentials:
                 logging.warning("No credentials found in MongoDB. Using default credentials.")
                 # Fallback to default credentials if MongoDB is empty
-                self.credentials_cache = {
-                    "admin": hashlib.sha256("admin123".encode()).hexdigest(),
-                    "trainer": hashlib.sha256("train456".encode()).hexdigest(),
-                }
+                self.credentials_cache = dict(self.default_credentials)
             else:
-                # Load credentials from MongoDB
-                for _, row in df.iterrows():
-                    self.credentials_cache[row['user_id']] = row['hashed_password']
+                self.credentials_cache = credentials
                 
                 logging.info(f"Loaded {len(self.credentials_cache)} credentials from MongoDB.")
+
+            self._loaded = True
+            return True
                 
         except Exception as e:
             logging.error(f"Error loading credentials from MongoDB: {str(e)}")
-            logging.info("Falling back to default credentials.")
-            # Fallback to default credentials
-            self.credentials_cache = {
-                "admin": hashlib.sha256("admin123".encode()).hexdigest(),
-                "trainer": hashlib.sha256("train456".encode()).hexdigest(),
-            }
+
+            if self._loaded:
+                # A transient failure must not replace real credentials with the defaults
+                logging.info("Keeping previously loaded credentials.")
+            else:
+                logging.info("Falling back to default credentials.")
+                self.credentials_cache = dict(self.default_credentials)
+
+            return False
     
     def verify_credentials(self, user_id: str, password: str) -> bool:
         """
@@ -102,16 +163,24 @@ class CredentialManager:
             bool: True if credentials are valid, False otherwise
         """
         try:
+            if time.monotonic() > self._cache_expiry:
+                self.refresh_credentials()
+
             if user_id not in self.credentials_cache:
                 logging.warning(f"Login attempt with unknown user_id: {user_id}")
+                # Run a full verification anyway so response time does not reveal whether the user exists
+                verify_password(self.dummy_hash, password)
                 return False
             
-            # Hash the provided password and compare with stored hash
-            hashed_password = hashlib.sha256(password.encode()).hexdigest()
-            is_valid = self.credentials_cache[user_id] == hashed_password
+            # Verify the provided password against the stored Argon2id hash (or legacy SHA-256 digest)
+            stored_hash = self.credentials_cache[user_id]
+            is_valid = verify_password(stored_hash, password)
             
             if is_valid:
                 logging.info(f"Successful login for user: {user_id}")
+
+                if password_needs_rehash(stored_hash):
+                    self.upgrade_hash(user_id, stored_hash, password)
             else:
                 logging.warning(f"Failed login attempt for user: {user_id}")
             
@@ -121,19 +190,43 @@ class CredentialManager:
             logging.error(f"Error verifying credentials: {str(e)}")
             return False
     
-    def reload_credentials(self):
+    def upgrade_hash(self, user_id: str, stored_hash: str, password: str):
+        """
+        Replaces a legacy (or outdated) stored hash with a fresh Argon2id hash after a successful login.
+        Failures are logged only; the user is already authenticated.
+        """
+        try:
+            new_hash = hash_password(password)
+
+            # Match on the old hash too, so a concurrent re-upload of the user is not overwritten
+            self.data_access.update_document(
+                collection_name = LOGIN_CREDENTIALS_COLLECTION_NAME,
+                query = {'user_id': user_id, 'hashed_password': stored_hash},
+                fields = {'hashed_password': new_hash}
+            )
+            self.credentials_cache[user_id] = new_hash
+            logging.info(f"Upgraded stored password hash to Argon2id for user: {user_id}")
+
+        except Exception as e:
+            logging.error(f"Error upgrading password hash for user {user_id}: {str(e)}")
+
+    def refresh_credentials(self):
         """
-        Reload credentials from MongoDB (useful after updates).
+        Reload credentials from MongoDB if the cache has expired.
         """
-        self.load_credentials()
+        with self._lock:
+            # Another thread may have refreshed the cache while we waited
+            if time.monotonic() > self._cache_expiry:
+                # Retry a failed load sooner than the regular TTL
+                delay = self._ttl if self.load_credentials() else CREDENTIALS_REFRESH_RETRY_SECONDS
+                self._cache_expiry = time.monotonic() + delay
 
+    def reload_credentials(self):
+        """
+        Expire the cache so credentials are reloaded from MongoDB on next use (useful after updates).
+        """
+        self._cache_expiry = 0.0
 
-# Initialize credential manager globally
-try:
-    credential_manager = CredentialManager()
-except Exception as e:
-    logging.error(f"Failed to initialize credential manager: {str(e)}")
-    credential_manager = None
 
 
 class DataForm:
@@ -204,27 +297,16 @@ async def trainRouteClient(
         Template response with success/error message
     """
     try:
+        credential_manager = request.app.state.cred_mgr
+
         # Check if credential manager is initialized
         if credential_manager is None:
-            return templates.TemplateResponse(
-                "vehicle_data.html",
-                {
-                    "request": request,
-                    "error_message": "Authentication system is not available. Please contact administrator.",
-                    "context": None
-                }
-            )
+            return Response(content=AUTH_UNAVAILABLE_PAGE, media_type="text/html")
         
-        # Verify user credentials from MongoDB
-        if not credential_manager.verify_credentials(user_id, password):
-            return templates.TemplateResponse(
-                "vehicle_data.html",
-                {
-                    "request": request,
-                    "error_message": "Invalid User ID or Password!",
-                    "context": None
-                }
-            )
+        # Verify user credentials from MongoDB; Argon2id verification (and any cache refresh)
+        # is CPU/IO-bound, so it runs in a worker thread instead of blocking the event loop
+        if not await asyncio.to_thread(credential_manager.verify_credentials, user_id, password):
+            return Response(content=INVALID_CREDENTIALS_PAGE, media_type="text/html")
         
         # If credentials are valid, start training
         logging.info(f"Starting model training initiated by user: {user_id}")
@@ -304,14 +386,15 @@ async def predictRouteClient(request: Request):
 
 # Optional: Endpoint to reload credentials (useful for development)
 @app.get("/reload-credentials")
-async def reload_credentials():
+async def reload_credentials(request: Request):
     """
     Reload credentials from MongoDB without restarting the server.
     """
     try:
+        credential_manager = request.app.state.cred_mgr
         if credential_manager:
             credential_manager.reload_credentials()
-            return {"status": "success", "message": "Credentials reloaded from MongoDB"}
+            return {"status": "success", "message": "Credentials will be reloaded from MongoDB on next login"}
         else:
             return {"status": "error", "message": "Credential manager not initialized"}
     except Exception as e:
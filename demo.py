@@ -29,14 +29,18 @@
 # pipline.run_pipeline()
 
 import sys
+import argparse
 from Upload_Training_Credential import CredentialUploader
 from src.exception import MyException
 from src.logger import logging
 
 
-def upload_demo_credentials():
+def upload_demo_credentials(show_all: bool = False):
     """
     Uploads demo/sample credentials to MongoDB for testing purposes.
+
+    :param show_all: If True, fetches and lists every credential stored in MongoDB
+                     instead of only the ones uploaded by this run.
     """
     try:
         print("=" * 60)
@@ -57,27 +61,30 @@ def upload_demo_credentials():
             print(f"  {i}. User ID: {cred['user_id']}")
         
         # Upload credentials to MongoDB
-        uploader.upload_credentials(demo_credentials)
+        inserted_count, updated_count = uploader.upload_credentials(demo_credentials)
         
         print("\n" + "=" * 60)
         print("Verifying uploaded credentials...")
         print("=" * 60)
+
+        print(f"\n✅ Credentials uploaded in this run: {inserted_count} new, {updated_count} updated")
         
-        # Fetch and display uploaded credentials (without passwords)
-        df = uploader.fetch_all_credentials()
-        
-        if not df.empty:
-            print(f"\n✅ Total credentials in database: {len(df)}")
-            print("\nCredentials Summary:")
-            print("-" * 60)
-            
-            # Display user_id and created_at timestamp
-            for idx, row in df.iterrows():
-                print(f"User ID: {row['user_id']:15} | Created: {row['created_at']}")
-            
-            print("-" * 60)
-        else:
-            print("\n⚠️ No credentials found in database.")
+        # Only query MongoDB again when every stored credential is requested
+        if show_all:
+            df = uploader.fetch_all_credentials()
+
+            if not df.empty:
+                print(f"\n✅ Total credentials in database: {len(df)}")
+                print("\nCredentials Summary:")
+                print("-" * 60)
+                
+                # Display user_id and created_at timestamp
+                for idx, row in df.iterrows():
+                    print(f"User ID: {row['user_id']:15} | Created: {row['created_at']}")
+                
+                print("-" * 60)
+            else:
+                print("\n⚠️ No credentials found in database.")
         
         print("\n" + "=" * 60)
         print("✅ Demo Credential Upload Completed Successfully!")
@@ -94,8 +101,13 @@ def upload_demo_credentials():
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Upload demo login credentials to MongoDB.")
+    parser.add_argument("--show-all", action="store_true",
+                        help="List every credential stored in MongoDB, not just the ones uploaded now.")
+    args = parser.parse_args()
+
     try:
-        upload_demo_credentials()
+        upload_demo_credentials(show_all=args.show_all)
     except Exception as e:
         print(f"\n❌ Fatal Error: {str(e)}")
         sys.exit(1)
\ No newline at end of file
@@ -1,15 +1,20 @@
 import boto3
-from src.configuration.aws_connection import S3Client
-from io import StringIO
+from src.configuration.aws_connection import get_s3_client
+from io import StringIO, BytesIO
 from typing import Union,List
 import os,sys
+import time
 import yaml
 from src.logger import logging
 from mypy_boto3_s3.service_resource import Bucket, Object
 from src.exception import MyException
 from botocore.exceptions import ClientError
 from pandas import DataFrame, read_csv
-import pickle
+from concurrent.futures import ThreadPoolExecutor
+from src.constants import S3_MAX_WORKERS, S3_PARALLEL_GET_THRESHOLD, S3_PARALLEL_GET_PART_SIZE, S3_PARALLEL_GET_CONCURRENCY, \
+    S3_PREFIX_CACHE_TTL_SECONDS
+from pyarrow import csv as pa_csv
+from src.utils.main_utils import RestrictedUnpickler
 
 
 class SimpleStorageService:
@@ -19,14 +24,18 @@ class SimpleStorageService:
     data uploads, and data retrieval in S3 buckets.
     """
 
+    # Recent prefix listings, shared across instances: {(bucket_name, prefix): (listed_at, objects)}
+    prefix_cache = {}
+
     def __init__(self):
 
         """
         Initializes the SimpleStorageService instance with S3 resource and client
-        from the S3Client class.
+        from the shared, process-wide S3Client.
         """
 
-        s3_client = S3Client()
+        s3_client = get_s3_client()
+        self.s3_connection = s3_client
         self.s3_resource = s3_client.s3_resource
         self.s3_client = s3_client.s3_client
 
@@ -44,15 +53,147 @@ class SimpleStorageService:
         """
 
         try:
-            bucket = self.get_bucket(bucket_name)
-            s3_objects = [s3_object for s3_object in bucket.objects.filter(Prefix = s3_key)]
-            return len(s3_objects) > 0
+            # A single listing of at most one key is enough to tell whether anything matches
+            s3_client = self.s3_connection.get_resource_for_bucket(bucket_name).meta.client
+            response = s3_client.list_objects_v2(Bucket = bucket_name, Prefix = s3_key, MaxKeys = 1)
+            return response.get("KeyCount", 0) > 0
         
         except Exception as e:
             raise MyException(e, sys)
+
+
+    def list_keys(self, bucket_name: str, prefix: str = "") -> List[str]:
+
+        """
+        Lists all object keys under a prefix in the specified bucket.
+
+        Args:
+            bucket_name (str): Name of the S3 bucket.
+            prefix (str): Key prefix to list; defaults to the whole bucket.
+
+        Returns:
+            List[str]: Keys of all matching objects.
+        """
+
+        try:
+            s3_client = self.s3_connection.get_resource_for_bucket(bucket_name).meta.client
+            paginator = s3_client.get_paginator("list_objects_v2")
+
+            return [s3_object["Key"]
+                    for page in paginator.paginate(Bucket = bucket_name, Prefix = prefix)
+                    for s3_object in page.get("Contents", [])]
+
+        except Exception as e:
+            raise MyException(e, sys)
+
+
+    def s3_key_exists(self, bucket_name, s3_key) -> bool:
+
+        """
+        Checks if an exact S3 key exists in the specified bucket, using a single HeadObject request.
+
+        Args:
+            bucket_name (str): Name of the S3 bucket.
+            s3_key (str): Exact key of the file to check.
+
+        Returns:
+            bool: True if the file exists, False otherwise.
+        """
+
+        try:
+            s3_client = self.s3_connection.get_resource_for_bucket(bucket_name).meta.client
+            s3_client.head_object(Bucket = bucket_name, Key = s3_key)
+            return True
+
+        except ClientError as e:
+            if SimpleStorageService.is_missing_key(e):
+                return False
+            raise MyException(e, sys)
+
+        except Exception as e:
+            raise MyException(e, sys)
+
+
+    @staticmethod
+    def is_missing_key(error: BaseException) -> bool:
+
+        """
+        Tells whether an error (or the ClientError it wraps) means the requested key does not exist.
+
+        Args:
+            error (BaseException): The raised error, e.g. a MyException from read_object or load_model.
+
+        Returns:
+            bool: True if S3 answered 404 / NoSuchKey.
+        """
+
+        error = error if isinstance(error, ClientError) else error.__cause__
+        return isinstance(error, ClientError) and error.response["Error"]["Code"] in ("404", "NoSuchKey", "NotFound")
         
 
 
+    @staticmethod
+    def _object_size(s3_object: Object) -> int:
+
+        """
+        Returns the size in bytes of an S3 object.
+
+        Objects listed from a bucket (ObjectSummary) already carry their size;
+        a plain Object falls back to a HEAD request.
+        """
+
+        size = getattr(s3_object, "size", None)
+        return s3_object.content_length if size is None else size
+
+
+    @staticmethod
+    def _parallel_get(s3_object: Object, size: int, part_size: int = S3_PARALLEL_GET_PART_SIZE,
+                      concurrency: int = S3_PARALLEL_GET_CONCURRENCY) -> BytesIO:
+
+        """
+        Downloads an S3 object as concurrent byte-range GETs, written in place into one buffer.
+
+        Every range is requested with the object's ETag (If-Match), so an object overwritten
+        mid-download fails with 412 instead of mixing parts of two versions.
+
+        Args:
+            s3_object (Object): The S3 object to download.
+            size (int): Total size of the object in bytes.
+            part_size (int): Size of each byte range.
+            concurrency (int): Maximum number of ranges downloaded at once.
+
+        Returns:
+            BytesIO: Stream over the full content of the object, positioned at the start.
+        """
+
+        client = s3_object.meta.client
+        etag = s3_object.e_tag
+
+        # Sole owner of its initial bytes, so the writable view below does not copy them
+        stream = BytesIO(bytes(size))
+        view = stream.getbuffer()
+
+        def fetch_range(start: int) -> None:
+            end = min(start + part_size, size) - 1
+            response = client.get_object(Bucket = s3_object.bucket_name, Key = s3_object.key,
+                                         Range = f"bytes={start}-{end}", IfMatch = etag)
+            chunk = response["Body"].read()
+
+            if len(chunk) != end - start + 1:
+                raise IOError(f"Range {start}-{end} of s3://{s3_object.bucket_name}/{s3_object.key} "
+                              f"returned {len(chunk)} bytes")
+
+            view[start:end + 1] = chunk
+
+        try:
+            with ThreadPoolExecutor(max_workers = concurrency) as executor:
+                list(executor.map(fetch_range, range(0, size, part_size)))
+        finally:
+            view.release()
+
+        return stream
+
+
     @staticmethod
     def read_object(s3_object : Object, decode : bool = True, make_readable : bool = False) -> Union[StringIO, bytes]:
 
@@ -71,16 +212,24 @@ class SimpleStorageService:
         logging.info("Entered the read_object method of SimpleStorageService class")
 
         try:
-            # Read and decode the object content if decode=True
-            func = (
-                lambda : s3_object.get()["Body"].read().decode()
-                if decode else s3_object.get()["Body"].read()
-            )
+            # Large binary objects (e.g. models) are fetched as concurrent byte ranges
+            if not decode:
+                size = SimpleStorageService._object_size(s3_object)
+                if size > S3_PARALLEL_GET_THRESHOLD:
+                    # getvalue() hands over the stream's buffer without copying it
+                    return SimpleStorageService._parallel_get(s3_object, size).getvalue()
+
+            data = s3_object.get()["Body"].read()
+
+            # Decode the object content if decode=True
+            if decode:
+                data = data.decode()
 
             # Convert to StringIO if make_readable=True
-            conv_func = lambda: StringIO(func()) if make_readable else func()
-            # logging.info("Exited the read_object method of SimpleStorageService class")
-            return conv_func()
+            if make_readable:
+                return StringIO(data)
+
+            return data
         
         except Exception as e:
             raise MyException(e, sys) from e
@@ -145,7 +294,7 @@ class SimpleStorageService:
         logging.info("Entered the get_bucket method of SimpleStorageService class")
 
         try:
-            bucket = self.s3_resource.Bucket(bucket_name)
+            bucket = self.s3_connection.get_resource_for_bucket(bucket_name).Bucket(bucket_name)
             logging.info("Exited the get_bucket method of SimpleStorageService class")
             return bucket
         
@@ -169,8 +318,16 @@ class SimpleStorageService:
         logging.info("Entered the get_objects_by_prefix method of SimpleStorageService class")
 
         try:
-            bucket = self.get_bucket(bucket_name)
-            s3_objects = [s3_object for s3_object in bucket.objects.filter(Prefix=filename)]
+            # Reuse a recent listing of the same prefix instead of issuing another LIST request
+            cache_key = (bucket_name, filename)
+            cached = SimpleStorageService.prefix_cache.get(cache_key)
+
+            if cached is not None and time.monotonic() - cached[0] < S3_PREFIX_CACHE_TTL_SECONDS:
+                s3_objects = cached[1]
+            else:
+                bucket = self.get_bucket(bucket_name)
+                s3_objects = [s3_object for s3_object in bucket.objects.filter(Prefix=filename)]
+                SimpleStorageService.prefix_cache[cache_key] = (time.monotonic(), s3_objects)
 
             func = lambda x: x[0] if len(x) == 1 else x
             file_objs = func(s3_objects)
@@ -181,34 +338,67 @@ class SimpleStorageService:
             raise MyException(e, sys) from e
 
 
+    @staticmethod
+    def invalidate_prefix_cache(bucket_name: str) -> None:
+
+        """
+        Drops all cached prefix listings of a bucket, after its contents have changed.
+
+        Args:
+            bucket_name (str): The name of the S3 bucket.
+        """
+
+        for cache_key in list(SimpleStorageService.prefix_cache):
+            if cache_key[0] == bucket_name:
+                SimpleStorageService.prefix_cache.pop(cache_key, None)
+
+
+    def get_object_exact(self, key: str, bucket_name: str) -> Object:
+
+        """
+        Returns the S3 object for an exact key, without listing the bucket.
+
+        Args:
+            key (str): The exact object key.
+            bucket_name (str): The name of the S3 bucket.
+
+        Returns:
+            Object: S3 object; a missing key surfaces as a 404 ClientError on first access.
+        """
+
+        logging.info("Entered the get_object_exact method of SimpleStorageService class")
+
+        try:
+            s3_object = self.s3_connection.get_resource_for_bucket(bucket_name).Object(bucket_name, key)
+            logging.info("Exited the get_object_exact method of SimpleStorageService class")
+            return s3_object
+
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+
     def load_model(self, model_name: str, bucket_name: str, model_dir: str = None) -> object:
         """
         Loads a serialized ML model from S3.
 
-        Ensures exactly one model file exists.
+        The model is addressed by its exact key; a missing model raises an error.
         """
 
         try:
             model_key = f"{model_dir}/{model_name}" if model_dir else model_name
 
-            s3_object = self.get_objects_by_prefix(model_key, bucket_name)
-
-            # Ensure exactly one model exists
-            if isinstance(s3_object, list):
-                if len(s3_object) == 0:
-                    raise FileNotFoundError("No model found in S3.")
-                elif len(s3_object) > 1:
-                    raise ValueError(
-                        f"Multiple models found for prefix '{model_key}'. "
-                        "Please ensure only one model exists."
-                    )
-                s3_object = s3_object[0]
+            s3_object = self.get_object_exact(model_key, bucket_name)
 
-            # Read binary model file
-            model_bytes = self.read_object(s3_object, decode=False)
+            # Large models are downloaded as parallel byte ranges; smaller ones are
+            # unpickled straight off the response stream without an intermediate copy
+            size = self._object_size(s3_object)
+            if size > S3_PARALLEL_GET_THRESHOLD:
+                model_stream = self._parallel_get(s3_object, size)
+            else:
+                model_stream = s3_object.get()["Body"]
 
-            # Deserialize model
-            model = pickle.loads(model_bytes)
+            # Deserialize model, only allowing globals from the model's own libraries
+            model = RestrictedUnpickler(model_stream).load()
 
             logging.info("Model successfully loaded from S3.")
             return model
@@ -232,13 +422,14 @@ class SimpleStorageService:
 
         try:
             # Check if folder exists by attempting to load it
-            self.s3_resource.Object(bucket_name, folder_name).load()
+            self.s3_connection.get_resource_for_bucket(bucket_name).Object(bucket_name, folder_name).load()
 
         except ClientError as e:
             # If folder does not exist, create it
             if e.response["Error"]["Code"] == "404":
                 folder_obj = folder_name + "/"
-                self.s3_client.put_object(Bucket = bucket_name, Key = folder_obj)
+                self.s3_connection.get_resource_for_bucket(bucket_name).meta.client.put_object(Bucket = bucket_name, Key = folder_obj)
+                self.invalidate_prefix_cache(bucket_name)
 
             logging.info("Exited the create_folder method of SimpleStorageService class")
 
@@ -259,7 +450,8 @@ class SimpleStorageService:
 
         try:
             logging.info(f"Uploading {from_filename} to {to_filename} in {bucket_name}")
-            self.s3_resource.meta.client.upload_file(from_filename, bucket_name, to_filename)
+            self.s3_connection.get_transfer(bucket_name).upload_file(from_filename, bucket_name, to_filename)
+            self.invalidate_prefix_cache(bucket_name)
             logging.info(f"Uploaded {from_filename} to {to_filename} in {bucket_name}")
 
             # Delete the local file if remove is True
@@ -308,9 +500,11 @@ class SimpleStorageService:
         """
         Uploads a DataFrame as a CSV file to the specified S3 bucket.
 
+        The CSV is encoded in memory and streamed to S3, without a temporary local file.
+
         Args:
             data_frame (DataFrame): DataFrame to be uploaded.
-            local_filename (str): Temporary local filename for the DataFrame.
+            local_filename (str): Unused; kept for backward compatibility.
             bucket_filename (str): Target filename in the bucket.
             bucket_name (str): Name of the S3 bucket.
         """
@@ -318,21 +512,58 @@ class SimpleStorageService:
         logging.info("Entered the upload_df_as_csv method of SimpleStorageService class")
 
         try:
-            # Save DataFrame to CSV locally and then upload it
-            data_frame.to_csv(local_filename, index=None, header=True)
-            self.upload_file(local_filename, bucket_filename, bucket_name)
+            # Encode DataFrame to CSV in memory and upload it directly
+            buffer = BytesIO()
+            data_frame.to_csv(buffer, index=None, header=True)
+            buffer.seek(0)
+
+            s3_client = self.s3_connection.get_resource_for_bucket(bucket_name).meta.client
+            s3_client.upload_fileobj(buffer, bucket_name, bucket_filename, Config = self.s3_connection.transfer_config)
+            self.invalidate_prefix_cache(bucket_name)
             logging.info("Exited the upload_df_as_csv method of SimpleStorageService class")
 
         except Exception as e:
             raise MyException(e, sys) from e
 
 
-    def get_df_from_object(self, object_: Union[Object, List[Object]]) -> Union[DataFrame, List[DataFrame]]:
+    def _read_one_csv(self, s3_object: Object) -> DataFrame:
+        """
+        Reads a single S3 object and parses it as a CSV DataFrame.
+
+        The response stream is handed straight to pandas, so the raw content
+        is never buffered as a whole string before parsing.
+
+        Args:
+            s3_object (Object): S3 object holding CSV content.
+
+        Returns:
+            DataFrame: Parsed DataFrame.
+        """
+        return read_csv(s3_object.get()["Body"])
+
+
+    def _read_csvs_parallel(self, s3_objects: List[Object], max_workers: int) -> List[DataFrame]:
+        """
+        Reads several S3 CSV objects concurrently, preserving input order.
+
+        Args:
+            s3_objects (List[Object]): S3 objects holding CSV content.
+            max_workers (int): Maximum number of concurrent downloads.
+
+        Returns:
+            List[DataFrame]: Parsed DataFrames, in the same order as s3_objects.
+        """
+        with ThreadPoolExecutor(max_workers = max_workers) as executor:
+            return list(executor.map(self._read_one_csv, s3_objects))
+
+
+    def get_df_from_object(self, object_: Union[Object, List[Object]], max_workers: int = S3_MAX_WORKERS) -> Union[DataFrame, List[DataFrame]]:
         """
         Converts one or more S3 objects into Pandas DataFrames.
 
         Args:
             object_ (Object | List[Object]): S3 object(s)
+            max_workers (int): Maximum number of objects downloaded concurrently.
 
         Returns:
             DataFrame | List[DataFrame]: Parsed DataFrame(s)
@@ -343,18 +574,13 @@ class SimpleStorageService:
         try:
             # Case 1: Multiple S3 objects
             if isinstance(object_, list):
-                dataframes = []
-                for obj in object_:
-                    content = self.read_objects_safe(obj, make_readable=True)
-                    df = read_csv(content)
-                    dataframes.append(df)
+                dataframes = self._read_csvs_parallel(object_, max_workers)
 
                 logging.info("Converted multiple S3 objects to DataFrames")
                 return dataframes
 
             # Case 2: Single S3 object
-            content = self.read_objects_safe(object_, make_readable=True)
-            df = read_csv(content)
+            df = self._read_one_csv(object_)
 
             logging.info("Converted single S3 object to DataFrame")
             return df
@@ -363,13 +589,14 @@ class SimpleStorageService:
             raise MyException(e, sys) from e
 
 
-    def read_csv(self, filename: str, bucket_name: str) -> Union[DataFrame, List[DataFrame]]:
+    def read_csv(self, filename: str, bucket_name: str, max_workers: int = S3_MAX_WORKERS) -> Union[DataFrame, List[DataFrame]]:
         """
         Reads one or more CSV files from the specified S3 bucket and converts them into DataFrame(s).
 
         Args:
             filename (str): The object key or prefix in the S3 bucket.
             bucket_name (str): Name of the S3 bucket.
+            max_workers (int): Maximum number of files downloaded concurrently.
 
         Returns:
             DataFrame | List[DataFrame]: 
@@ -385,21 +612,76 @@ class SimpleStorageService:
 
             # Case 1: Multiple objects returned
             if isinstance(s3_objects, list):
-                dataframes = []
-                for obj in s3_objects:
-                    content = self.read_objects_safe(obj, make_readable=True)
-                    df = read_csv(content)
-                    dataframes.append(df)
+                dataframes = self._read_csvs_parallel(s3_objects, max_workers)
 
                 logging.info(f"Loaded {len(dataframes)} CSV files from S3")
                 return dataframes
 
             # Case 2: Single object returned
-            content = self.read_objects_safe(s3_objects, make_readable=True)
-            df = read_csv(content)
+            df = self._read_one_csv(s3_objects)
 
             logging.info("Loaded single CSV file from S3")
             return df
 
         except Exception as e:
             raise MyException(e, sys) from e
+
+
+    def read_csv_stream(self, filename: str, bucket_name: str, **pd_kwargs) -> DataFrame:
+        """
+        Reads a single CSV file from S3 by parsing its response stream directly.
+
+        Extra keyword arguments are passed to pandas.read_csv, so options such as
+        `nrows` or `usecols` can stop or narrow the read without downloading more than needed.
+
+        Args:
+            filename (str): The exact object key in the S3 bucket.
+            bucket_name (str): Name of the S3 bucket.
+            **pd_kwargs: Keyword arguments forwarded to pandas.read_csv.
+
+        Returns:
+            DataFrame: Parsed DataFrame.
+        """
+
+        logging.info("Entered the read_csv_stream method of SimpleStorageService class")
+
+        try:
+            s3_client = self.s3_connection.get_resource_for_bucket(bucket_name).meta.client
+            body = s3_client.get_object(Bucket = bucket_name, Key = filename)["Body"]
+            df = read_csv(body, **pd_kwargs)
+
+            logging.info("Exited the read_csv_stream method of SimpleStorageService class")
+            return df
+
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+
+    def read_csv_arrow(self, filename: str, bucket_name: str) -> DataFrame:
+        """
+        Reads a single CSV file from S3 with Arrow's multi-threaded CSV parser.
+
+        The object is streamed and parsed natively, skipping the Python-level decode
+        and intermediate copies of the pandas path.
+
+        Args:
+            filename (str): The exact object key in the S3 bucket.
+            bucket_name (str): Name of the S3 bucket.
+
+        Returns:
+            DataFrame: Parsed DataFrame.
+        """
+
+        logging.info("Entered the read_csv_arrow method of SimpleStorageService class")
+
+        try:
+            filesystem = self.s3_connection.get_arrow_filesystem(bucket_name)
+
+            with filesystem.open_input_stream(f"{bucket_name}/{filename}") as stream:
+                df = pa_csv.read_csv(stream).to_pandas()
+
+            logging.info("Exited the read_csv_arrow method of SimpleStorageService class")
+            return df
+
+        except Exception as e:
+            raise MyException(e, sys) from e
@@ -9,6 +9,8 @@ from src.entity.artifact_entity import DataIngestionArtifact
 from src.exception import MyException
 from src.logger import logging
 from src.data_access.proj1_data import Proj1Data
+from src.constants import SCHEMA_FILE_PATH
+from src.utils.main_utils import read_yaml_file
 
 class DataIngestion:
     
@@ -34,7 +36,8 @@ class DataIngestion:
             logging.info(f"Exporting data from mongodb")
 
             my_data = Proj1Data()
-            dataframe = my_data.export_collection_as_dataframe(collection_name = self.data_ingestion_config.collection_name)
+            dataframe = my_data.export_collection_as_arrow_dataframe(collection_name = self.data_ingestion_config.collection_name,
+                                                                     schema_config = read_yaml_file(file_path = SCHEMA_FILE_PATH))
             logging.info(f"Shape of dataframe: {dataframe.shape}")
 
             feature_store_file_path  = self.data_ingestion_config.feature_store_file_path
@@ -114,7 +114,7 @@ class DataTransformation:
         drop_col = self._schema_config['drop_columns']
 
         if drop_col in df.columns:
-            df = df.drop(drop_col, axis=1)
+            df = df.drop(columns = drop_col)
         return df
 
     def initiate_data_transformation(self) -> DataTransformationArtifact:
@@ -131,10 +131,10 @@ class DataTransformation:
             test_df = self.read_data(file_path = self.data_ingestion_artifact.test_file_path)
             logging.info("Train-Test data loaded")
 
-            input_feature_train_df = train_df.drop(columns = [TARGET_COLUMN], axis = 1)
+            input_feature_train_df = train_df.drop(columns = [TARGET_COLUMN])
             target_feature_train_df = train_df[TARGET_COLUMN]
 
-            input_feature_test_df = test_df.drop(columns=[TARGET_COLUMN], axis=1)
+            input_feature_test_df = test_df.drop(columns=[TARGET_COLUMN])
             target_feature_test_df = test_df[TARGET_COLUMN]
 
             logging.info("Input and Target cols defined for both train and test df.")
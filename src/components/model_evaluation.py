@@ -1,14 +1,12 @@
 from src.entity.config_entity import ModelEvaluationConfig
 from src.entity.artifact_entity import DataTransformationArtifact, ModelTrainerArtifact, ModelEvaluationArtifact
-from sklearn.metrics import f1_score
 from src.exception import MyException
 from src.logger import logging
 from src.utils.main_utils import write_yaml_file, read_yaml_file
 import sys
-import pandas as pd
 from typing import Optional
 from src.entity.s3_estimator import Proj1Estimator
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict
 
 @dataclass
 class EvaluateModelResponse:
@@ -46,7 +44,8 @@ class ModelEvaluation:
             model_metric_path = self.model_eval_config.s3_model_metric_path
             proj1_estimator = Proj1Estimator(bucket_name = bucket_name, model_path = model_path, model_metric_path = model_metric_path)
 
-            if proj1_estimator.is_model_present(model_path = model_path) and proj1_estimator.is_model_metric_present(model_metric_path = model_metric_path):
+            # Only the metrics are needed for evaluation; the model is just checked for presence
+            if proj1_estimator.prefetch(include_model = False):
                 return proj1_estimator
             
             return None
@@ -96,20 +95,15 @@ class ModelEvaluation:
                                            is_model_accepted = trained_model_f1_score > tmp_best_model_score,
                                            difference = trained_model_f1_score - tmp_best_model_score)
             
-            comparison_report = {
-                "trained_model_f1_score" : result.trained_model_f1_score,
-                "best_model_f1_score" : result.best_model_f1_score,
-                "is_model_accepted" : result.is_model_accepted,
-                "difference" : result.difference
-            }
-
-            logging.info(f"Writing model evaluation report to {self.model_eval_config.model_evaluation_report_file_path}")
+            comparison_report = asdict(result)
+
+            logging.info("Writing model evaluation report to %s", self.model_eval_config.model_evaluation_report_file_path)
             write_yaml_file(file_path = self.model_eval_config.model_evaluation_report_file_path, content = comparison_report)
              
-            logging.info(f"Result: {comparison_report}")
+            logging.info("Result: %s", comparison_report)
             logging.info(
-                f"Evaluation Summary | New: {trained_model_f1_score}, "
-                f"Old: {best_model_f1_score}, Accepted: {trained_model_f1_score > (best_model_f1_score or 0)}"
+                "Evaluation Summary | New: %s, Old: %s, Accepted: %s",
+                trained_model_f1_score, best_model_f1_score, result.is_model_accepted
             )
 
             logging.info("Model Evaluation Completed.") 
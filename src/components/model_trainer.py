@@ -3,11 +3,11 @@ from typing import Tuple
 
 import numpy as np
 from sklearn.ensemble import RandomForestClassifier
-from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score
+from sklearn.metrics import accuracy_score
 
 from src.exception import MyException
 from src.logger import logging
-from src.utils.main_utils import load_numpy_array_data, load_object, save_object, write_yaml_file
+from src.utils.main_utils import load_numpy_array_data, load_object, save_object, write_yaml_file, RestrictedUnpickler
 from src.entity.config_entity import ModelTrainerConfig
 from src.entity.artifact_entity import DataTransformationArtifact, ModelTrainerArtifact, ClassificationMetricArtifact
 from src.entity.estimator import MyModel
@@ -22,6 +22,31 @@ class ModelTrainer:
         self.data_transformation_artifact = data_transformation_artifact
         self.model_trainer_config = model_trainer_config
 
+    @staticmethod
+    def get_binary_classification_scores(y_true: np.ndarray, y_pred: np.ndarray) -> Tuple[float, float, float, float]:
+        """
+        Method Name :   get_binary_classification_scores
+        Description :   Computes accuracy, F1, precision and recall for 0/1 labels from a single
+                        pass of confusion counts, instead of one sklearn metric call per score.
+                        Scores with a zero denominator are reported as 0.0, like sklearn.
+
+        Output      :   Returns (accuracy, f1, precision, recall) as floats
+        """
+        y_true = np.asarray(y_true) == 1
+        y_pred = np.asarray(y_pred) == 1
+
+        tp = int(np.count_nonzero(y_true & y_pred))
+        fp = int(np.count_nonzero(~y_true & y_pred))
+        fn = int(np.count_nonzero(y_true & ~y_pred))
+        tn = y_true.size - tp - fp - fn
+
+        accuracy = (tp + tn) / y_true.size if y_true.size else 0.0
+        f1 = 2 * tp / (2 * tp + fp + fn) if tp + fp + fn else 0.0
+        precision = tp / (tp + fp) if tp + fp else 0.0
+        recall = tp / (tp + fn) if tp + fn else 0.0
+
+        return float(accuracy), float(f1), float(precision), float(recall)
+
     def get_model_object_and_report(self, train: np.array, test: np.array) -> Tuple[object, object]:
         """
         Method Name :   get_model_object_and_report
@@ -54,10 +79,7 @@ class ModelTrainer:
 
             # Predictions and evaluation metrics
             y_pred = model.predict(x_test)
-            accuracy = accuracy_score(y_test, y_pred)
-            f1 = f1_score(y_test, y_pred)
-            precision = precision_score(y_test, y_pred)
-            recall = recall_score(y_test, y_pred)
+            accuracy, f1, precision, recall = self.get_binary_classification_scores(y_test, y_pred)
 
             # Creating metric artifact
             metric_artifact = ClassificationMetricArtifact(accuracy_score = accuracy, f1_score = f1, precision_score = precision, recall_score = recall)
@@ -87,17 +109,18 @@ class ModelTrainer:
         try:
             print("------------------------------------------------------------------------------------------------")
             print("Starting Model Trainer Component")
-            # Load transformed train and test data
-            train_arr = load_numpy_array_data(file_path = self.data_transformation_artifact.transformed_train_file_path)
-            test_arr = load_numpy_array_data(file_path = self.data_transformation_artifact.transformed_test_file_path)
+            # Load transformed train and test data (memory-mapped; the model copies what it needs)
+            train_arr = load_numpy_array_data(file_path = self.data_transformation_artifact.transformed_train_file_path, mmap_mode = 'r')
+            test_arr = load_numpy_array_data(file_path = self.data_transformation_artifact.transformed_test_file_path, mmap_mode = 'r')
             logging.info("train-test data loaded")
             
             # Train model and get metrics
             trained_model, metric_artifact, metric_artifact_dict = self.get_model_object_and_report(train = train_arr, test = test_arr)
             logging.info("Model object and artifact loaded.")
             
-            # Load preprocessing object
-            preprocessing_obj = load_object(file_path = self.data_transformation_artifact.transformed_object_file_path)
+            # Load preprocessing object into RAM: it is pickled again inside MyModel, and memmapped
+            # arrays would be saved as numpy.memmap
+            preprocessing_obj = load_object(file_path = self.data_transformation_artifact.transformed_object_file_path, mmap_mode = None)
             logging.info("Preprocessing obj loaded.")
 
             # Check if the model's accuracy meets the expected threshold
@@ -111,6 +134,11 @@ class ModelTrainer:
             save_object(self.model_trainer_config.trained_model_file_path, my_model)
             logging.info("Saved final model object that includes both preprocessing and the trained model")
 
+            # Fail here rather than in prediction if the saved model cannot pass the S3 loader's allow-list
+            with open(self.model_trainer_config.trained_model_file_path, "rb") as model_file:
+                RestrictedUnpickler(model_file).load()
+            logging.info("Verified saved model loads through RestrictedUnpickler")
+
             logging.info("Saving model metric artifact")
             write_yaml_file(file_path = self.model_trainer_config.trained_model_metric_artifact_file_path, content = metric_artifact_dict, replace = True)
             logging.info("Saved model metric artifact")
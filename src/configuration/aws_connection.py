@@ -1,32 +1,175 @@
 import boto3
 import os
-from src.constants import AWS_SECRET_ACCESS_KEY, AWS_ACCESS_KEY_ID, AWS_REGION_NAME
+import atexit
+import threading
+from boto3.s3.transfer import TransferConfig, S3Transfer
+from pyarrow import fs as pa_fs
+from functools import lru_cache
+from botocore.config import Config
+from botocore.exceptions import ClientError
+from src.logger import logging
+from src.constants import get_aws_credentials, AWS_REGION_NAME, S3_MAX_POOL_CONNECTIONS, \
+    S3_CONNECT_TIMEOUT, S3_READ_TIMEOUT, S3_MAX_ATTEMPTS, S3_MULTIPART_THRESHOLD, S3_MULTIPART_CHUNKSIZE, \
+    S3_TRANSFER_MAX_CONCURRENCY
 
 
 class S3Client:
 
     s3_client = None
     s3_resource = None
+    region_name = None
+
+    # Bucket -> region lookups and per-region resources/filesystems/transfers, shared across all instances
+    bucket_regions = {}
+    regional_resources = {}
+    regional_filesystems = {}
+    regional_transfers = {}
+
+    # Guards creation of the shared clients so concurrent threads build them only once
+    _lock = threading.RLock()
+
+    # Keep TCP connections alive and size the pool so parallel transfers reuse them;
+    # fail fast on connect and retry throttled requests with adaptive back-off
+    config = Config(max_pool_connections = S3_MAX_POOL_CONNECTIONS,
+                    tcp_keepalive = True,
+                    connect_timeout = S3_CONNECT_TIMEOUT,
+                    read_timeout = S3_READ_TIMEOUT,
+                    retries = {'mode': 'adaptive', 'total_max_attempts': S3_MAX_ATTEMPTS})
+
+    # Multipart settings for uploads; large payloads are split and sent in parallel parts
+    transfer_config = TransferConfig(multipart_threshold = S3_MULTIPART_THRESHOLD,
+                                     multipart_chunksize = S3_MULTIPART_CHUNKSIZE,
+                                     max_concurrency = S3_TRANSFER_MAX_CONCURRENCY,
+                                     use_threads = True)
 
     def __init__(self, region_name = AWS_REGION_NAME):
-        """ 
-        This Class gets aws credentials from src/constant and creates an connection with s3 bucket 
+        """
+        This Class gets aws credentials from src/constant and creates an connection with s3 bucket
         and raise exception when environment variable is not set
         """
 
-        if S3Client.s3_resource == None or S3Client.s3_client == None:
-            __access_key_id = AWS_ACCESS_KEY_ID
-            __secret_access_key = AWS_SECRET_ACCESS_KEY
-        
-            S3Client.s3_resource = boto3.resource('s3',
-                                            aws_access_key_id = __access_key_id,
-                                            aws_secret_access_key = __secret_access_key,
-                                            region_name = region_name)
-            
-            S3Client.s3_client = boto3.client('s3',
-                                        aws_access_key_id = __access_key_id,
-                                        aws_secret_access_key = __secret_access_key,
-                                        region_name = region_name)
-            
+        if S3Client.s3_resource is None or S3Client.s3_client is None:
+            with S3Client._lock:
+                # Re-check under the lock: another thread may have finished initialising first
+                if S3Client.s3_resource is None or S3Client.s3_client is None:
+                    S3Client.s3_client = S3Client._create_client(region_name)
+                    S3Client.region_name = region_name
+                    S3Client.regional_resources[region_name] = S3Client._create_resource(region_name)
+                    S3Client.s3_resource = S3Client.regional_resources[region_name]
+
         self.s3_resource = S3Client.s3_resource
-        self.s3_client = S3Client.s3_client
\ No newline at end of file
+        self.s3_client = S3Client.s3_client
+
+    @staticmethod
+    def _create_resource(region_name):
+        access_key_id, secret_access_key = get_aws_credentials()
+        return boto3.resource('s3',
+                              aws_access_key_id = access_key_id,
+                              aws_secret_access_key = secret_access_key,
+                              region_name = region_name,
+                              config = S3Client.config)
+
+    @staticmethod
+    def _create_client(region_name):
+        access_key_id, secret_access_key = get_aws_credentials()
+        return boto3.client('s3',
+                            aws_access_key_id = access_key_id,
+                            aws_secret_access_key = secret_access_key,
+                            region_name = region_name,
+                            config = S3Client.config)
+
+    def get_bucket_region(self, bucket_name):
+        """
+        Returns the region a bucket lives in, looked up with a single HeadBucket call
+        and cached, falling back to the default region if it cannot be determined.
+        """
+
+        if bucket_name not in S3Client.bucket_regions:
+            try:
+                response = self.s3_client.head_bucket(Bucket = bucket_name)
+            except ClientError as e:
+                # S3 still reports the bucket region on redirects and access errors
+                response = e.response
+
+            headers = response.get("ResponseMetadata", {}).get("HTTPHeaders", {})
+            S3Client.bucket_regions[bucket_name] = headers.get("x-amz-bucket-region", S3Client.region_name)
+
+        return S3Client.bucket_regions[bucket_name]
+
+    def get_resource_for_bucket(self, bucket_name):
+        """
+        Returns an S3 resource bound to the bucket's own region, so requests are not
+        redirected and connections are not torn down when the bucket is in another region.
+        """
+
+        region_name = self.get_bucket_region(bucket_name)
+
+        if region_name not in S3Client.regional_resources:
+            with S3Client._lock:
+                if region_name not in S3Client.regional_resources:
+                    S3Client.regional_resources[region_name] = S3Client._create_resource(region_name)
+
+        return S3Client.regional_resources[region_name]
+
+    def get_arrow_filesystem(self, bucket_name):
+        """
+        Returns a pyarrow S3FileSystem bound to the bucket's region, for reading objects
+        as native Arrow streams.
+        """
+
+        region_name = self.get_bucket_region(bucket_name)
+
+        if region_name not in S3Client.regional_filesystems:
+            with S3Client._lock:
+                if region_name not in S3Client.regional_filesystems:
+                    access_key_id, secret_access_key = get_aws_credentials()
+                    S3Client.regional_filesystems[region_name] = pa_fs.S3FileSystem(access_key = access_key_id,
+                                                                                    secret_key = secret_access_key,
+                                                                                    region = region_name)
+
+        return S3Client.regional_filesystems[region_name]
+
+    def get_transfer(self, bucket_name):
+        """
+        Returns an S3Transfer bound to the bucket's region, created once per region and
+        shared by every caller so consecutive uploads reuse one multipart thread pool.
+        """
+
+        region_name = self.get_bucket_region(bucket_name)
+
+        if region_name not in S3Client.regional_transfers:
+            with S3Client._lock:
+                if region_name not in S3Client.regional_transfers:
+                    s3_client = self.get_resource_for_bucket(bucket_name).meta.client
+                    S3Client.regional_transfers[region_name] = S3Transfer(client = s3_client,
+                                                                          config = S3Client.transfer_config)
+
+        return S3Client.regional_transfers[region_name]
+
+    @staticmethod
+    def close_transfers():
+        """
+        Shuts down the shared transfers and their thread pools; registered to run at exit.
+
+        S3Transfer has no shutdown method of its own; leaving its context shuts down the
+        underlying TransferManager. One failing transfer does not stop the others from closing.
+        """
+
+        with S3Client._lock:
+            while S3Client.regional_transfers:
+                region_name, transfer = S3Client.regional_transfers.popitem()
+                try:
+                    transfer.__exit__(None, None, None)
+                except Exception as e:
+                    logging.warning(f"Could not shut down the S3 transfer for {region_name}: {e}")
+
+
+atexit.register(S3Client.close_transfers)
+
+
+@lru_cache(maxsize=None)
+def get_s3_client() -> S3Client:
+    """
+    Returns the process-wide S3Client, creating it on first call.
+    """
+    return S3Client()
@@ -2,14 +2,34 @@ import os
 import sys
 import pymongo
 import certifi
+from functools import lru_cache
 
 from src.exception import MyException
 from src.logger import logging
-from src.constants import DATABASE_NAME, MONGODB_URL_KEY
+from src.constants import DATABASE_NAME, get_mongodb_url, MONGODB_MAX_POOL_SIZE, MONGODB_MIN_POOL_SIZE, \
+    MONGODB_COMPRESSORS
 
 # Load the certificate authority file to avoid timeout errors when connecting to MongoDB
 ca = certifi.where()
 
+
+@lru_cache(maxsize=None)
+def get_mongo_client() -> pymongo.MongoClient:
+    """
+    Returns the process-wide MongoClient, creating it (and its TLS connection pool) on first call.
+
+    A few pooled connections are kept warm, and wire traffic is compressed with the first
+    compressor both the driver and the server support (zstd needs the zstandard package,
+    zlib is always available).
+    """
+    return pymongo.MongoClient(get_mongodb_url(),
+                               tlsCAFile = ca,
+                               maxPoolSize = MONGODB_MAX_POOL_SIZE,
+                               minPoolSize = MONGODB_MIN_POOL_SIZE,
+                               compressors = MONGODB_COMPRESSORS,
+                               retryWrites = True)
+
+
 class MongoDBClient:
     """
     MongoDBClient is responsible for establishing a connection to the MongoDB database.
@@ -47,9 +67,8 @@ class MongoDBClient:
             # Check if a MongoDB client connection has already been established; if not, create a new one
             if MongoDBClient.client is None:
                 
-                mongo_db_url = MONGODB_URL_KEY  # Retrieve MongoDB URL from constants
-                # Establish a new MongoDB client connection
-                MongoDBClient.client = pymongo.MongoClient(mongo_db_url, tlsCAFile=ca)
+                # Reuse the process-wide pooled client instead of opening a new TLS connection
+                MongoDBClient.client = get_mongo_client()
                 
             # Use the shared MongoClient for this instance
             self.client = MongoDBClient.client
@@ -1,11 +1,15 @@
 import sys
 import pandas as pd
-import numpy as np
-from typing import Optional
+import pyarrow as pa
+from pymongoarrow.api import Schema, aggregate_arrow_all
+from itertools import islice
+from typing import Optional, Iterator, Iterable, Tuple
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, OperationFailure
 
 from src.logger import logging
 from src.configuration.mongo_db_connection import MongoDBClient
-from src.constants import DATABASE_NAME
+from src.constants import DATABASE_NAME, MONGODB_CURSOR_BATCH_SIZE, MONGODB_EXPORT_BATCH_SIZE, MONGODB_INSERT_BATCH_SIZE
 from src.exception import MyException
 
 class Proj1Data:
@@ -13,6 +17,9 @@ class Proj1Data:
     A class to export MongoDB records as a pandas DataFrame.
     """
 
+    # Arrow types for the dtypes used in config/schema.yaml
+    _ARROW_TYPES = {"int": pa.int64(), "float": pa.float64(), "category": pa.string()}
+
     def __init__(self) -> None:
         """
         Initializes the MongoDB client connection.
@@ -22,7 +29,8 @@ class Proj1Data:
         except Exception as e:
             raise MyException(e, sys)
 
-    def export_collection_as_dataframe(self, collection_name: str, database_name: Optional[str] = None) -> pd.DataFrame:
+    def export_collection_as_dataframe(self, collection_name: str, database_name: Optional[str] = None,
+                                       projection: Optional[dict] = None) -> pd.DataFrame:
         """
         Exports an entire MongoDB collection as a pandas DataFrame.
 
@@ -32,11 +40,13 @@ class Proj1Data:
             The name of the MongoDB collection to export.
         database_name : Optional[str]
             Name of the database (optional). Defaults to DATABASE_NAME.
+        projection : Optional[dict]
+            MongoDB projection selecting the fields to fetch (optional). Defaults to all fields except 'id'.
 
         Returns:
         -------
         pd.DataFrame
-            DataFrame containing the collection data, with '_id' column removed and 'na' values replaced with NaN.
+            DataFrame containing the collection data, with 'id' column removed and 'na' values replaced with NaN.
         """
         try:
             # Access specified collection from the default or specified database
@@ -45,19 +55,265 @@ class Proj1Data:
             else:
                 collection = self.mongo_client.client[database_name][collection_name]
 
-            # Convert collection data to DataFrame and preprocess
+            # The 'id' column is dropped server-side unless the caller asks for specific fields
+            if projection is None:
+                projection = {"id": 0}
+
+            # Map "na" strings to null on the server, for every field a sample document has
+            sample = collection.find_one({}, projection) or {}
+            pipeline = self._export_pipeline(projection, [field for field in sample if field != "_id"])
+
+            # Stream the collection in batches straight into a DataFrame
             print("Fetching data from mongoDB")
-            df = pd.DataFrame(list(collection.find()))
+            cursor = collection.aggregate(pipeline, allowDiskUse = True, batchSize = MONGODB_EXPORT_BATCH_SIZE)
+            df = pd.DataFrame.from_records(cursor)
             print(f"Data fecthed with len: {len(df)}")
-            if "id" in df.columns.to_list():
-                df = df.drop(columns=["id"], axis=1)
-            df.replace({"na":np.nan},inplace=True)
             return df
 
         except Exception as e:
             raise MyException(e, sys)
         
-    def insert_dataframe(self, df: pd.DataFrame, collection_name: str) -> None:
+    def export_collection_as_arrow_dataframe(self, collection_name: str, schema_config: dict,
+                                             database_name: Optional[str] = None) -> pd.DataFrame:
+        """
+        Exports an entire MongoDB collection as a pandas DataFrame, decoding BSON straight into
+        Arrow columns (via pymongoarrow) instead of building a Python dict per document.
+
+        Parameters:
+        ----------
+        collection_name : str
+            The name of the MongoDB collection to export.
+        schema_config : dict
+            Parsed config/schema.yaml; its 'columns' (except 'id') define the fields and their types.
+        database_name : Optional[str]
+            Name of the database (optional). Defaults to DATABASE_NAME.
+
+        Returns:
+        -------
+        pd.DataFrame
+            Arrow-backed DataFrame with the same columns as export_collection_as_dataframe
+            ('_id' as a string), with 'na' values as nulls.
+        """
+        try:
+            if database_name is None:
+                collection = self.mongo_client.database[collection_name]
+            else:
+                collection = self.mongo_client.client[database_name][collection_name]
+
+            # 'id' is dropped and '_id' is kept (as a string) to match export_collection_as_dataframe
+            column_types = {name: dtype for column in schema_config["columns"] for name, dtype in column.items()}
+            column_types.pop("id", None)
+
+            schema = Schema({"_id": pa.string(),
+                             **{name: self._ARROW_TYPES[dtype] for name, dtype in column_types.items()}})
+            pipeline = self._export_pipeline({"id": 0}, list(column_types))
+            pipeline.append({"$addFields": {"_id": {"$toString": "$_id"}}})
+
+            print("Fetching data from mongoDB")
+            table = aggregate_arrow_all(collection, pipeline, schema = schema, allowDiskUse = True,
+                                        batchSize = MONGODB_EXPORT_BATCH_SIZE)
+            df = table.to_pandas(types_mapper = pd.ArrowDtype)
+            print(f"Data fecthed with len: {len(df)}")
+            return df
+
+        except Exception as e:
+            raise MyException(e, sys)
+
+    @staticmethod
+    def _export_pipeline(projection: dict, fields: list) -> list:
+        """
+        Builds the export aggregation: applies the projection, then maps "na" strings to null in the given fields.
+        """
+        pipeline = [{"$project": projection}]
+        na_fields = {field: {"$cond": [{"$eq": [f"${field}", "na"]}, None, f"${field}"]} for field in fields}
+        if na_fields:
+            pipeline.append({"$addFields": na_fields})
+        return pipeline
+
+    def iter_projected(self, collection_name: str, projection: dict, database_name: Optional[str] = None,
+                       batch_size: int = MONGODB_CURSOR_BATCH_SIZE) -> Iterator[dict]:
+        """
+        Iterates over the documents of a MongoDB collection, returning only the projected fields.
+        Documents are streamed from the server in batches rather than fetched all at once.
+
+        Parameters:
+        ----------
+        collection_name : str
+            The name of the MongoDB collection to read.
+        projection : dict
+            MongoDB projection selecting the fields to return (e.g. {'user_id': 1, '_id': 0}).
+        database_name : Optional[str]
+            Name of the database (optional). Defaults to DATABASE_NAME.
+        batch_size : int
+            Number of documents fetched per round-trip. Defaults to MONGODB_CURSOR_BATCH_SIZE.
+
+        Returns:
+        -------
+        Iterator[dict]
+            Cursor yielding one projected document per record.
+        """
+        try:
+            # Access specified collection from the default or specified database
+            if database_name is None:
+                collection = self.mongo_client.database[collection_name]
+            else:
+                collection = self.mongo_client.client[database_name][collection_name]
+
+            return collection.find({}, projection).batch_size(batch_size)
+
+        except Exception as e:
+            raise MyException(e, sys)
+
+    def remove_duplicates(self, collection_name: str, field: str, keep_latest_by: str) -> int:
+        """
+        Deletes all but the newest document for every value of a field that occurs more than once.
+
+        Parameters:
+        ----------
+        collection_name : str
+            Target MongoDB collection name.
+        field : str
+            Field whose values should be unique.
+        keep_latest_by : str
+            Field ordering the duplicates; the document with the highest value is kept.
+
+        Returns:
+        -------
+        int
+            Number of documents deleted.
+        """
+        try:
+            collection = self.mongo_client.database[collection_name]
+
+            pipeline = [
+                {"$sort": {keep_latest_by: -1}},
+                {"$group": {"_id": f"${field}", "ids": {"$push": "$_id"}, "count": {"$sum": 1}}},
+                {"$match": {"count": {"$gt": 1}}},
+            ]
+            stale_ids = [_id for group in collection.aggregate(pipeline, allowDiskUse = True) for _id in group["ids"][1:]]
+
+            if not stale_ids:
+                return 0
+
+            deleted_count = collection.delete_many({"_id": {"$in": stale_ids}}).deleted_count
+            logging.warning(f"Removed {deleted_count} duplicate '{field}' records from MongoDB collection '{collection_name}'.")
+            return deleted_count
+
+        except Exception as e:
+            raise MyException(e, sys)
+
+    def update_document(self, collection_name: str, query: dict, fields: dict) -> int:
+        """
+        Sets fields on the first document matching a query.
+
+        Parameters:
+        ----------
+        collection_name : str
+            Target MongoDB collection name.
+        query : dict
+            MongoDB filter selecting the document.
+        fields : dict
+            Field values to set.
+
+        Returns:
+        -------
+        int
+            Number of documents modified (0 or 1).
+        """
+        try:
+            collection = self.mongo_client.database[collection_name]
+            return collection.update_one(query, {"$set": fields}).modified_count
+
+        except Exception as e:
+            raise MyException(e, sys)
+
+    def ensure_unique_index(self, collection_name: str, field: str, keep_latest_by: Optional[str] = None) -> None:
+        """
+        Creates a unique index on a field of a MongoDB collection, if it does not already exist.
+
+        Parameters:
+        ----------
+        collection_name : str
+            Target MongoDB collection name.
+        field : str
+            Field whose values must be unique across the collection.
+        keep_latest_by : Optional[str]
+            If the collection already holds duplicates, keep only the newest document per value
+            (ordered by this field) and retry. Without it, existing duplicates raise an error.
+        """
+        try:
+            collection = self.mongo_client.database[collection_name]
+
+            try:
+                collection.create_index(field, unique=True)
+
+            except OperationFailure as e:
+                # 11000: existing documents violate the new unique index
+                if e.code != 11000 or keep_latest_by is None:
+                    raise
+
+                self.remove_duplicates(collection_name, field, keep_latest_by)
+                collection.create_index(field, unique=True)
+
+            logging.info(f"Ensured unique index on '{field}' for MongoDB collection '{collection_name}'.")
+
+        except Exception as e:
+            raise MyException(e, sys)
+
+    @staticmethod
+    def _nan_to_none(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Replaces NaN with None (MongoDB does not support NaN), only in columns that have any;
+        clean columns keep their dtype and are not copied. The input DataFrame is not modified.
+        """
+        na_mask = df.isna()
+        nan_columns = df.columns[na_mask.any()].tolist()
+        if nan_columns:
+            df = df.copy(deep=False)
+            for column in nan_columns:
+                values = df[column].to_numpy(dtype=object, copy=True)
+                values[na_mask[column].to_numpy()] = None
+                df[column] = values
+        return df
+
+    @staticmethod
+    def _row_iter(df: pd.DataFrame) -> Iterator[dict]:
+        """
+        Yields the DataFrame rows one dict at a time, so records are built only as the driver encodes them.
+        """
+        columns = df.columns.tolist()
+        for row in df.itertuples(index=False, name=None):
+            yield dict(zip(columns, row))
+
+    @staticmethod
+    def _insert_records(collection, records: Iterable[dict], collection_name: str) -> int:
+        """
+        Inserts one chunk of records, unordered so one conflicting record does not stop the rest.
+        Duplicate-key conflicts are logged and skipped; any other write error is raised.
+
+        Returns:
+        -------
+        int
+            Number of records inserted from this chunk.
+        """
+        try:
+            result = collection.insert_many(records, ordered=False)
+            return len(result.inserted_ids)
+
+        except BulkWriteError as bwe:
+            write_errors = bwe.details.get("writeErrors", [])
+            duplicate_errors = [err for err in write_errors if err.get("code") == 11000]
+
+            # Only duplicate-key conflicts are expected; anything else is a real failure
+            if len(duplicate_errors) != len(write_errors):
+                raise
+
+            logging.warning(
+                f"Skipped {len(duplicate_errors)} duplicate records in MongoDB collection '{collection_name}'."
+            )
+            return bwe.details.get("nInserted", 0)
+
+    def insert_dataframe(self, df: pd.DataFrame, collection_name: str) -> int:
         """
         Inserts a pandas DataFrame into MongoDB collection.
 
@@ -67,27 +323,78 @@ class Proj1Data:
             DataFrame to be inserted into MongoDB.
         collection_name : str
             Target MongoDB collection name.
+
+        Returns:
+        -------
+        int
+            Number of records inserted (records rejected as duplicates are not counted).
         """
 
         try:
             if df.empty:
                 raise ValueError("DataFrame is empty. Nothing to insert.")
 
-            # Replace NaN with None (MongoDB does not support NaN)
-            df = df.where(pd.notnull(df), None)
-
-            # Convert DataFrame to list of dictionaries
-            records = df.to_dict(orient="records")
+            df = self._nan_to_none(df)
 
             # Get collection
             collection = self.mongo_client.database[collection_name]
 
-            # Insert data
-            result = collection.insert_many(records)
+            # Stream rows in bounded chunks so neither the records nor their BSON exist for the whole DataFrame at once
+            inserted_count = 0
+            rows = self._row_iter(df)
+            for _ in range(0, len(df), MONGODB_INSERT_BATCH_SIZE):
+                records = islice(rows, MONGODB_INSERT_BATCH_SIZE)
+                inserted_count += self._insert_records(collection, records, collection_name)
+
+            logging.info(
+                f"Inserted {inserted_count} records into MongoDB collection '{collection_name}'."
+            )
+            return inserted_count
+
+        except Exception as e:
+            raise MyException(e, sys)
+
+    def upsert_dataframe(self, df: pd.DataFrame, collection_name: str, key_field: str) -> Tuple[int, int]:
+        """
+        Inserts or replaces the fields of each DataFrame row in a MongoDB collection, matching rows
+        to existing documents on key_field.
+
+        Parameters:
+        ----------
+        df : pd.DataFrame
+            DataFrame to be written into MongoDB.
+        collection_name : str
+            Target MongoDB collection name.
+        key_field : str
+            Column identifying a document (should have a unique index).
+
+        Returns:
+        -------
+        Tuple[int, int]
+            Number of documents inserted and number of existing documents updated.
+        """
+
+        try:
+            if df.empty:
+                raise ValueError("DataFrame is empty. Nothing to upsert.")
+
+            df = self._nan_to_none(df)
+            collection = self.mongo_client.database[collection_name]
+
+            inserted_count, updated_count = 0, 0
+            rows = self._row_iter(df)
+            for _ in range(0, len(df), MONGODB_INSERT_BATCH_SIZE):
+                requests = [UpdateOne({key_field: record[key_field]}, {"$set": record}, upsert=True)
+                            for record in islice(rows, MONGODB_INSERT_BATCH_SIZE)]
+                result = collection.bulk_write(requests, ordered=False)
+                inserted_count += result.upserted_count
+                updated_count += result.modified_count
 
             logging.info(
-                f"Inserted {len(result.inserted_ids)} records into MongoDB collection '{collection_name}'."
+                f"Upserted records into MongoDB collection '{collection_name}': "
+                f"{inserted_count} inserted, {updated_count} updated."
             )
+            return inserted_count, updated_count
 
         except Exception as e:
             raise MyException(e, sys)
@@ -2,6 +2,9 @@ from src.cloud_storage.aws_storage import SimpleStorageService
 from src.exception import MyException
 from src.entity.estimator import MyModel
 import sys
+import yaml
+from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
 from pandas import DataFrame
 
 class Proj1Estimator:
@@ -22,12 +25,13 @@ class Proj1Estimator:
         self.model_path = model_path
         self.model_metric_path = model_metric_path
         self.loaded_model : MyModel = None
+        self.loaded_metrics : dict = None
 
 
     def is_model_present(self, model_path):
 
         try:
-            return self.s3.s3_key_path_available(bucket_name = self.bucket_name, s3_key = model_path)
+            return self.s3.s3_key_exists(bucket_name = self.bucket_name, s3_key = model_path)
         
         except MyException as e:
             print(e)
@@ -36,13 +40,83 @@ class Proj1Estimator:
     def is_model_metric_present(self, model_metric_path):
 
         try:
-            return self.s3.s3_key_path_available(bucket_name = self.bucket_name, s3_key = model_metric_path)
+            return self.s3.s3_key_exists(bucket_name = self.bucket_name, s3_key = model_metric_path)
 
         except MyException as e:
             print(e)
             return False
         
 
+    def prefetch(self, include_model : bool = True) -> bool:
+
+        """
+        Downloads the metrics (and the model) by their exact keys and caches them, so later
+        predict/load_metrics calls stay local. A missing key answers 404, so no listing is needed
+        :param include_model: If False, only the metrics are downloaded and the model is checked with a HEAD
+        :return: True if both the model and its metrics are present in the bucket
+        """
+
+        try:
+            if include_model:
+                with ThreadPoolExecutor(max_workers = 2) as executor:
+                    metrics_future = executor.submit(self._fetch_metrics)
+                    model_future = executor.submit(self._fetch_model)
+                    metrics, model = metrics_future.result(), model_future.result()
+
+                if metrics is None or model is None:
+                    return False
+
+                self.loaded_model = model
+
+            else:
+                metrics = self._fetch_metrics()
+
+                if metrics is None or not self.is_model_present(self.model_path):
+                    return False
+
+            self.loaded_metrics = metrics
+            return True
+
+        except Exception as e:
+            raise MyException(e, sys)
+
+
+    def _fetch_model(self) -> Optional[MyModel]:
+
+        """
+        Downloads the model by its exact key
+        :return: The model, or None if it is not in the bucket
+        """
+
+        try:
+            return self.load_model()
+
+        except MyException as e:
+            if self.s3.is_missing_key(e):
+                return None
+            raise
+
+
+    def _fetch_metrics(self) -> Optional[dict]:
+
+        """
+        Downloads the metrics by their exact key
+        :return: The parsed metrics, or None if they are not in the bucket
+        """
+
+        s3_object = self.s3.get_object_exact(self.model_metric_path, self.bucket_name)
+
+        try:
+            content = self.s3.read_object(s3_object, decode = True)
+
+        except MyException as e:
+            if self.s3.is_missing_key(e):
+                return None
+            raise
+
+        return yaml.safe_load(content)
+
+
     def load_model(self) -> MyModel:
 
         """
@@ -55,11 +129,23 @@ class Proj1Estimator:
     def load_metrics(self):
 
         """
-        Load the metrics from the model_path
+        Load the metrics from the model_metric_path (served from cache once prefetched)
         :return:
         """
 
-        return self.s3.load_yaml(file_key = self.model_metric_path, bucket_name = self.bucket_name)
+        if self.loaded_metrics is not None:
+            return self.loaded_metrics
+
+        try:
+            metrics = self._fetch_metrics()
+
+            if metrics is None:
+                raise FileNotFoundError(f"s3://{self.bucket_name}/{self.model_metric_path} does not exist")
+
+            return metrics
+
+        except Exception as e:
+            raise MyException(e, sys)
     
 
     def save_model(self, from_file, remove : bool = False)->None:
@@ -1,8 +1,11 @@
+import atexit
 import logging
 import os
-from logging.handlers import RotatingFileHandler
+import queue
+import threading
+from functools import lru_cache
+from logging.handlers import TimedRotatingFileHandler, QueueHandler, QueueListener
 from from_root import from_root
-from datetime import datetime
 
 # -------------------------------------------------------------------
 # LOGGING CONFIGURATION CONSTANTS
@@ -11,27 +14,23 @@ from datetime import datetime
 # Directory where log files will be stored
 LOG_DIR = 'logs'
 
-# Create a timestamped log file name (helps in log versioning)
-LOG_FILE = f"{datetime.now().strftime('%m_%d_%Y_%H_%M_%S')}.log"
+# Single log file shared by every run; rotated at midnight into app.log.YYYY-MM-DD
+LOG_FILE = "app.log"
 
-# Maximum size of a single log file (5 MB)
-MAX_LOG_SIZE = 5 * 1024 * 1024  
-
-# Number of backup log files to retain
-BACKUP_COUNT = 3  
+# Number of daily log files to retain
+BACKUP_COUNT = 7
 
 # -------------------------------------------------------------------
-# CREATE LOG DIRECTORY PATH
+# LOG DIRECTORY PATH
 # -------------------------------------------------------------------
 
-# Get project root path using from_root()
-log_dir_path = os.path.join(from_root(), LOG_DIR)
-
-# Create logs directory if it does not exist
-os.makedirs(log_dir_path, exist_ok=True)
+@lru_cache(maxsize=1)
+def _project_root():
+    """
+    Returns the project root from from_root(), which walks the filesystem, so it is resolved only once.
+    """
+    return from_root()
 
-# Full path of the log file
-log_file_path = os.path.join(log_dir_path, LOG_FILE)
 
 # -------------------------------------------------------------------
 # LOGGER CONFIGURATION FUNCTION
@@ -40,26 +39,43 @@ log_file_path = os.path.join(log_dir_path, LOG_FILE)
 def configure_logger():
     """
     Configures application-wide logging with:
-    - Rotating file handler (persistent logs)
+    - Daily rotating file handler (persistent logs), written from a background thread
     - Console handler (real-time logs)
     """
 
+    # The format below never uses source file/line, thread or process fields,
+    # so skip the frame walk and lookups that populate them on every record
+    logging._srcfile = None
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+
     # Create root logger
     logger = logging.getLogger()
     logger.setLevel(logging.DEBUG)
 
-    # Log message format
+    # Log message format (explicit datefmt skips the default milliseconds suffix)
     formatter = logging.Formatter(
-        "[ %(asctime)s ] %(name)s - %(levelname)s - %(message)s"
+        "[ %(asctime)s ] %(name)s - %(levelname)s - %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+        style="%"
     )
 
     # -----------------------------
     # File Handler (Persistent logs)
     # -----------------------------
-    file_handler = RotatingFileHandler(
+    # Full path of the log file; the logs directory is created on first configuration
+    log_dir_path = os.path.join(_project_root(), LOG_DIR)
+    os.makedirs(log_dir_path, exist_ok=True)
+    log_file_path = os.path.join(log_dir_path, LOG_FILE)
+
+    # The file is opened on the first write; rollover is a time comparison, not a per-record stat
+    file_handler = TimedRotatingFileHandler(
         log_file_path,
-        maxBytes=MAX_LOG_SIZE,
-        backupCount=BACKUP_COUNT
+        when="midnight",
+        backupCount=BACKUP_COUNT,
+        encoding="utf-8",
+        delay=True
     )
     file_handler.setFormatter(formatter)
     file_handler.setLevel(logging.DEBUG)
@@ -71,10 +87,67 @@ def configure_logger():
     console_handler.setFormatter(formatter)
     console_handler.setLevel(logging.INFO)
 
+    # -----------------------------
+    # Queue Handler (Non-blocking file writes)
+    # -----------------------------
+    # Callers only enqueue the record; the listener thread does the file write and flush
+    log_queue = queue.Queue(-1)
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.setLevel(logging.DEBUG)
+
+    listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+    listener.start()
+
+    # Drain pending records to the file on interpreter shutdown
+    atexit.register(listener.stop)
+
     # Attach handlers to the logger
-    logger.addHandler(file_handler)
+    logger.addHandler(queue_handler)
     logger.addHandler(console_handler)
 
 
-# Initialize logger configuration
-configure_logger()
\ No newline at end of file
+# -------------------------------------------------------------------
+# LAZY INITIALIZATION
+# -------------------------------------------------------------------
+
+_configured = False
+_configure_lock = threading.Lock()
+
+
+def _ensure_configured():
+    """
+    Runs configure_logger() exactly once, on the first log record or get_logger() call.
+    """
+    global _configured
+
+    if not _configured:
+        with _configure_lock:
+            if not _configured:
+                configure_logger()
+                _configured = True
+
+
+class _LazyConfigHandler(logging.Handler):
+    """
+    Placeholder root handler that configures logging when the first record arrives.
+
+    The real handlers are appended after it on the root logger, so that first record
+    (and every later one) is handled by them directly; afterwards this is a no-op.
+    """
+
+    def emit(self, record):
+        _ensure_configured()
+
+
+def get_logger(name=None):
+    """
+    Returns a logger, configuring the application handlers first if needed.
+    """
+    _ensure_configured()
+    return logging.getLogger(name)
+
+
+# Only register the placeholder at import; log directory and files are created on first use.
+# The root level is set here so records reach the placeholder at all.
+logging.getLogger().setLevel(logging.DEBUG)
+logging.getLogger().addHandler(_LazyConfigHandler())
\ No newline at end of file
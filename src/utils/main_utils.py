@@ -1,21 +1,51 @@
 import os
 import sys
+import hmac
+import hashlib
+from typing import Optional
+import pickle
 import numpy as np
 import dill
+import joblib
+from joblib.numpy_pickle import NumpyUnpickler, NumpyArrayWrapper
+from joblib.numpy_pickle_utils import Unpickler
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 import yaml
+from argon2 import PasswordHasher
+from argon2.exceptions import VerifyMismatchError, InvalidHashError
 from pandas import DataFrame
 
 from src.exception import MyException
 from src.logger import logging
+from src.constants import ARGON2_TIME_COST, ARGON2_MEMORY_COST, ARGON2_PARALLELISM, CREDENTIAL_HASH_BATCH_MIN_SIZE, \
+    CREDENTIAL_HASH_MAX_WORKERS
 
 
 # ------------------------------------------------------------
 # YAML FILE UTILITIES
 # ------------------------------------------------------------
 
+# libyaml-backed C loader when PyYAML was built with it, pure-Python otherwise
+YamlSafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+YamlSafeDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+
+@lru_cache(maxsize=32)
+def _cached_yaml(file_path: str, mtime_ns: int, size: int) -> dict:
+    """
+    Parses a YAML file; cached per file version so a rewritten file is parsed again.
+    """
+    with open(file_path, "rb") as yaml_file:
+        return yaml.load(yaml_file, Loader=YamlSafeLoader)
+
+
 def read_yaml_file(file_path: str) -> dict:
     """
     Reads a YAML configuration file and returns its contents as a dictionary.
+
+    Results are cached until the file changes, so callers share the returned
+    dictionary and must not modify it.
     
     Args:
         file_path (str): Path to the YAML file.
@@ -24,8 +54,8 @@ def read_yaml_file(file_path: str) -> dict:
         dict: Parsed YAML content.
     """
     try:
-        with open(file_path, "rb") as yaml_file:
-            return yaml.safe_load(yaml_file)
+        stat = os.stat(file_path)
+        return _cached_yaml(file_path, stat.st_mtime_ns, stat.st_size)
 
     except Exception as e:
         raise MyException(e, sys) from e
@@ -47,7 +77,7 @@ def write_yaml_file(file_path: str, content: object, replace: bool = False) -> N
         os.makedirs(os.path.dirname(file_path), exist_ok=True)
 
         with open(file_path, "w") as file:
-            yaml.dump(content, file)
+            yaml.dump(content, file, Dumper=YamlSafeDumper, default_flow_style=False, sort_keys=False)
 
     except Exception as e:
         raise MyException(e, sys) from e
@@ -57,20 +87,22 @@ def write_yaml_file(file_path: str, content: object, replace: bool = False) -> N
 # MODEL / OBJECT SERIALIZATION UTILITIES
 # ------------------------------------------------------------
 
-def load_object(file_path: str) -> object:
+def load_object(file_path: str, mmap_mode: Optional[str] = 'r') -> object:
     """
-    Loads a serialized Python object using dill.
+    Loads a serialized Python object using joblib, memory-mapping its NumPy arrays.
+
+    Files written with plain pickle/dill load as well. Pass mmap_mode=None when the
+    object will be serialized again, so its arrays are not pickled as numpy.memmap.
 
     Args:
         file_path (str): Path of the serialized file.
+        mmap_mode (Optional[str]): joblib memory-map mode; None reads arrays into RAM.
 
     Returns:
-        object: Deserialized Python object.
+        object: Deserialized Python object (NumPy arrays are read-only memmaps if mmap_mode is set).
     """
     try:
-        with open(file_path, "rb") as file_obj:
-            obj = dill.load(file_obj)
-        return obj
+        return joblib.load(file_path, mmap_mode=mmap_mode)
 
     except Exception as e:
         raise MyException(e, sys) from e
@@ -78,7 +110,10 @@ def load_object(file_path: str) -> object:
 
 def save_object(file_path: str, obj: object) -> None:
     """
-    Saves any Python object to disk using dill.
+    Saves any Python object to disk using joblib, falling back to dill for
+    objects plain pickling cannot handle (e.g. closures).
+
+    Files are left uncompressed so their NumPy arrays can be memory-mapped on load.
 
     Args:
         file_path (str): Location where object will be stored.
@@ -88,8 +123,13 @@ def save_object(file_path: str, obj: object) -> None:
         logging.info("Saving object to disk")
 
         os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        with open(file_path, "wb") as file_obj:
-            dill.dump(obj, file_obj)
+        try:
+            joblib.dump(obj, file_path, protocol=pickle.HIGHEST_PROTOCOL)
+
+        except (pickle.PicklingError, AttributeError, TypeError):
+            logging.info("Object is not picklable with joblib, saving with dill instead")
+            with open(file_path, "wb") as file_obj:
+                dill.dump(obj, file_obj)
 
         logging.info("Object saved successfully")
 
@@ -97,6 +137,68 @@ def save_object(file_path: str, obj: object) -> None:
         raise MyException(e, sys) from e
 
 
+class RestrictedArrayWrapper(NumpyArrayWrapper):
+
+    """
+    joblib array wrapper whose object-dtype arrays (stored as a nested pickle stream) are read
+    through the outer unpickler's allow-list; some joblib versions read them with a bare pickle.load.
+    """
+
+    def read_array(self, unpickler, ensure_native_byte_order):
+        if self.dtype.hasobject:
+            inner_unpickler = Unpickler(unpickler.file_handle)
+            inner_unpickler.find_class = unpickler.find_class
+            return inner_unpickler.load()
+
+        return super().read_array(unpickler, ensure_native_byte_order)
+
+
+class RestrictedUnpickler(NumpyUnpickler):
+
+    """
+    Unpickler for joblib (and plain pickle) model files that only resolves globals from the
+    libraries a trained model is built from, so a tampered model file in S3 cannot import
+    and call arbitrary code while loading.
+    """
+
+    # Exactly the globals a pickled MyModel (Pipeline/ColumnTransformer/scalers + RandomForest) refers to.
+    # Matching is on whole (module, name) pairs: module prefixes would let any callable of those packages
+    # through (e.g. numpy.testing helpers that exec strings)
+    ALLOWED_GLOBALS = {
+        ("builtins", "slice"),
+        ("numpy", "dtype"),
+        ("numpy", "ndarray"),
+        ("numpy._core.multiarray", "_reconstruct"),
+        ("numpy._core.multiarray", "scalar"),
+        ("numpy.core.multiarray", "_reconstruct"),
+        ("numpy.core.multiarray", "scalar"),
+        ("numpy", "memmap"),
+        ("joblib.numpy_pickle", "NumpyArrayWrapper"),
+        ("sklearn.pipeline", "Pipeline"),
+        ("sklearn.compose._column_transformer", "ColumnTransformer"),
+        ("sklearn.preprocessing._data", "StandardScaler"),
+        ("sklearn.preprocessing._data", "MinMaxScaler"),
+        ("sklearn.preprocessing._function_transformer", "FunctionTransformer"),
+        ("sklearn.ensemble._forest", "RandomForestClassifier"),
+        ("sklearn.tree._classes", "DecisionTreeClassifier"),
+        ("sklearn.tree._tree", "Tree"),
+        ("src.entity.estimator", "MyModel"),
+    }
+
+    def __init__(self, file_handle):
+        super().__init__(filename = "", file_handle = file_handle, ensure_native_byte_order = True)
+
+    def find_class(self, module: str, name: str):
+        # Protocol 4+ resolves dotted names attribute by attribute, so "a.b" could reach
+        # anything importable from an allowed module; only plain names are accepted
+        if "." not in name and (module, name) in self.ALLOWED_GLOBALS:
+            if (module, name) == ("joblib.numpy_pickle", "NumpyArrayWrapper"):
+                return RestrictedArrayWrapper
+            return super().find_class(module, name)
+
+        raise pickle.UnpicklingError(f"Global '{module}.{name}' is not allowed in a model file")
+
+
 # ------------------------------------------------------------
 # NUMPY ARRAY UTILITIES
 # ------------------------------------------------------------
@@ -112,25 +214,149 @@ def save_numpy_array_data(file_path: str, array: np.ndarray):
     try:
         os.makedirs(os.path.dirname(file_path), exist_ok=True)
         with open(file_path, 'wb') as file_obj:
-            np.save(file_obj, array)
+            np.save(file_obj, array, allow_pickle=False)
 
     except Exception as e:
         raise MyException(e, sys) from e
 
 
-def load_numpy_array_data(file_path: str) -> np.ndarray:
+def load_numpy_array_data(file_path: str, mmap_mode: Optional[str] = None) -> np.ndarray:
     """
     Loads a NumPy array from disk.
 
     Args:
         file_path (str): Path to the saved NumPy file.
+        mmap_mode (Optional[str]): If set (e.g. 'r'), memory-maps the file instead of
+            reading it into RAM; pages are loaded only when accessed.
 
     Returns:
-        np.ndarray: Loaded NumPy array.
+        np.ndarray: Loaded NumPy array (a read-only memmap if mmap_mode is set).
     """
     try:
+        if mmap_mode is not None:
+            return np.load(file_path, mmap_mode=mmap_mode, allow_pickle=False)
+
         with open(file_path, 'rb') as file_obj:
-            return np.load(file_obj)
+            return np.load(file_obj, allow_pickle=False)
+
+    except Exception as e:
+        raise MyException(e, sys) from e
+
+
+# ------------------------------------------------------------
+# PASSWORD HASHING UTILITIES
+# ------------------------------------------------------------
+
+# Shared Argon2id hasher used for both credential upload and login verification
+password_hasher = PasswordHasher(
+    time_cost=ARGON2_TIME_COST,
+    memory_cost=ARGON2_MEMORY_COST,
+    parallelism=ARGON2_PARALLELISM
+)
+
+
+def hash_password(password: str) -> str:
+    """
+    Hashes a password using Argon2id.
+
+    Args:
+        password (str): Plain text password to hash.
+
+    Returns:
+        str: Encoded Argon2id hash (includes algorithm parameters and salt).
+    """
+    try:
+        return password_hasher.hash(password)
 
     except Exception as e:
-        raise MyException(e, sys) from e
\ No newline at end of file
+        raise MyException(e, sys) from e
+
+
+def hash_passwords(passwords: list) -> list:
+    """
+    Hashes a batch of passwords using Argon2id, in parallel across CPU cores.
+
+    Argon2 releases the GIL while hashing, so independent passwords are spread
+    over a thread pool. Small batches are hashed sequentially since the pool
+    start-up cost outweighs the gain. Every concurrent hash holds ARGON2_MEMORY_COST
+    KiB, so the pool is capped at CREDENTIAL_HASH_MAX_WORKERS threads.
+
+    Args:
+        passwords (list): Plain text passwords to hash.
+
+    Returns:
+        list: Encoded Argon2id hashes, in the same order as the input.
+    """
+    try:
+        if len(passwords) < CREDENTIAL_HASH_BATCH_MIN_SIZE:
+            return [password_hasher.hash(password) for password in passwords]
+
+        with ThreadPoolExecutor(max_workers=min(CREDENTIAL_HASH_MAX_WORKERS, os.cpu_count() or 1)) as executor:
+            return list(executor.map(password_hasher.hash, passwords))
+
+    except Exception as e:
+        raise MyException(e, sys) from e
+
+
+def is_legacy_password_hash(hashed_password: str) -> bool:
+    """
+    Checks whether a stored hash is an unsalted SHA-256 hex digest from before Argon2id was adopted.
+
+    Args:
+        hashed_password (str): Stored password hash.
+
+    Returns:
+        bool: True for a 64-character hex digest.
+    """
+    if len(hashed_password) != 64:
+        return False
+
+    try:
+        bytes.fromhex(hashed_password)
+        return True
+
+    except ValueError:
+        return False
+
+
+def verify_password(hashed_password: str, password: str) -> bool:
+    """
+    Verifies a plain text password against a stored Argon2id hash
+    (or a legacy SHA-256 hex digest).
+
+    Args:
+        hashed_password (str): Encoded Argon2id hash (or legacy digest) from the credential store.
+        password (str): Plain text password to verify.
+
+    Returns:
+        bool: True if the password matches, False otherwise.
+    """
+    if is_legacy_password_hash(hashed_password):
+        return hmac.compare_digest(hashlib.sha256(password.encode()).hexdigest(), hashed_password.lower())
+
+    try:
+        return password_hasher.verify(hashed_password, password)
+
+    except (VerifyMismatchError, InvalidHashError):
+        return False
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """
+    Checks whether a stored hash should be replaced by a fresh Argon2id hash after a successful login:
+    legacy SHA-256 digests, and Argon2 hashes made with different parameters.
+
+    Args:
+        hashed_password (str): Stored password hash.
+
+    Returns:
+        bool: True if the hash should be upgraded.
+    """
+    if is_legacy_password_hash(hashed_password):
+        return True
+
+    try:
+        return password_hasher.check_needs_rehash(hashed_password)
+
+    except InvalidHashError:
+        return False
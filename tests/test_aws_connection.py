@@ -0,0 +1,40 @@
+import boto3
+import pytest
+from moto import mock_aws
+
+from src.cloud_storage.aws_storage import SimpleStorageService
+from src.configuration.aws_connection import S3Client
+
+
+@pytest.fixture
+def s3_bucket(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+
+    with mock_aws():
+        boto3.client("s3", region_name = "us-east-1").create_bucket(Bucket = "test-bucket")
+        yield "test-bucket"
+
+    # Drop the clients bound to the mocked endpoint so other tests start clean
+    S3Client.close_transfers()
+    S3Client.s3_client = S3Client.s3_resource = None
+    S3Client.bucket_regions.clear()
+    S3Client.regional_resources.clear()
+
+
+def test_close_transfers_after_upload(s3_bucket, tmp_path):
+    local_file = tmp_path / "model.pkl"
+    local_file.write_bytes(b"model")
+
+    storage = SimpleStorageService()
+    storage.upload_file(str(local_file), "model.pkl", bucket_name = s3_bucket, remove = False)
+
+    transfer = S3Client.regional_transfers["us-east-1"]
+    assert storage.s3_key_exists(bucket_name = s3_bucket, s3_key = "model.pkl")
+
+    S3Client.close_transfers()
+
+    assert S3Client.regional_transfers == {}
+    assert transfer._manager._submission_executor._executor._shutdown
+    # Closing again at interpreter exit is a no-op
+    S3Client.close_transfers()